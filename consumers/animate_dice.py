@@ -4,26 +4,44 @@
 Animate live dice-roll proportions.
 
 Summary
-- Streams die rolls from `consumers.stream_consumer.consume_forever` and renders
+- Streams die rolls from a background producer thread
+  (`consumers.stream_consumer.start_producer`) and renders
   a live bar chart of cumulative face proportions with an expected 1/6 reference line.
-- Displays running counts as labels; title shows current sample size n.
+- Displays running counts as labels; an in-axes readout shows current sample size n.
 - Writes periodic snapshot rows to CSV via `utils.snapshot` (sidecar; no visual impact).
 
 Behavior
 - Fixed y-axis (0–0.5) to reduce jitter while proportions converge.
-- Bars recolor consistently by face; labels reposition for readability.
-- Title updates each frame with the latest n.
+- Bars recolor consistently by face; count labels ride just above each bar.
+- The six bars are a single PolyCollection backed by one (6, 4, 2) vertex
+  array; each frame writes all six heights with one NumPy assignment and a
+  single `set_verts` call, so blitting draws one artist instead of six.
+- Blitted via `utils.blit.BlitManager`: bars, count labels, and the n readout are
+  animated artists redrawn over a cached background each frame; the 1/6 line
+  and legend are redrawn after the bars to keep them on top. Axes and ticks
+  are only re-rendered on full draws (e.g., resize).
+  Only the axes region is cached and blitted; count labels are clipped to it.
+- Frames are driven by a canvas timer (FRAME_MS) rather than FuncAnimation.
+- Each frame drains whatever rolls have queued (up to MAX_PER_FRAME) and renders
+  only the final state, so the producer's delay_sec never blocks rendering and
+  fast streams do not fall behind the chart. Frames with no new rolls are
+  skipped entirely, so render cost tracks min(stream rate, frame rate).
+- The n / PAUSED / STOPPED readout is an AnchoredText inside the axes (not the
+  title), so it falls within the blitted region and status changes are shown
+  with a single blit rather than a full redraw.
 
 Snapshots
-- `utils.snapshot.init()` ensures the CSV exists; `maybe_write(n, counts)` appends
-  a row every `SNAPSHOT_EVERY` rolls.
+- `utils.snapshot.init()` ensures the CSV exists; after each roll
+  `should_write(n)` gates `write(n, counts)`, appending a row every
+  `SNAPSHOT_EVERY` rolls.
 - Fields: ts, n, max_abs_dev, chi2, p1..p6 (cumulative proportions), c1..c6 (cumulative counts).
 - Environment:
     SNAPSHOT_EVERY (default: 50)
     SNAPSHOT_PATH  (default: data/snapshots.csv)
 
 Controls
-- Space: pause / resume (title reflects PAUSED state with last n)
+- Space: pause / resume (readout reflects PAUSED state with last n; the producer
+         keeps rolling, and up to QUEUE_SIZE queued rolls are applied on resume)
 - X:     stop (freeze last frame; window remains open)
 - Q:     close the window (standard Matplotlib behavior)
 
@@ -37,24 +55,37 @@ Dependencies
 - Matplotlib for animation and plotting.
 - `consumers.stream_consumer` for the roll stream.
 - `utils.snapshot` for sidecar CSV snapshots.
+- `utils.blit` for cached-background blitting.
 """
 
 
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from consumers.stream_consumer import consume_forever
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.offsetbox import AnchoredText
+from consumers.stream_consumer import StreamConsumer, start_producer
 from utils import snapshot as snap  # NEW: sidecar snapshots; no visual impact
+from utils.blit import BlitManager
+
+FRAME_MS = 100        # render interval
+MAX_PER_FRAME = 1000  # cap on rolls consumed per frame
+QUEUE_SIZE = 1024     # producer -> UI buffer; oldest rolls dropped when full
+BAR_WIDTH = 0.8       # matches ax.bar's default width
+
+
+def _write_snapshot(sc):
+    # runs per roll: test the interval before slicing counts
+    if snap.should_write(sc.n):
+        snap.write(sc.n, sc.counts[1:])  # NEW: sidecar snapshot; chart unchanged
 
 
 def animate_live(delay_sec=0.1, seed=None):
     faces = [1, 2, 3, 4, 5, 6]
-    gen = consume_forever(delay_sec=delay_sec, seed=seed)
-
-    # Prime one frame
-    counts, props, n = next(gen)
+    sc = StreamConsumer()
+    q, stop_producer = start_producer(delay_sec=delay_sec, seed=seed, maxsize=QUEUE_SIZE)
+    counts, props, n = sc.current()
 
     snap.init()                 # NEW: ensure snapshots file exists
-    snap.maybe_write(n, counts) # NEW: write snapshot if interval
 
     #fig, ax = plt.subplots()
     fig, ax = plt.subplots(figsize=(7, 4), constrained_layout=True)
@@ -63,7 +94,7 @@ def animate_live(delay_sec=0.1, seed=None):
     
 
     labels  = [str(f) for f in faces]
-    heights = [props.get(f, 0.0) for f in faces]
+    heights = props.tolist()
     hex_colors = [
         "#bedfdd", 
         "#fcc2b3", 
@@ -72,7 +103,17 @@ def animate_live(delay_sec=0.1, seed=None):
         "#b89e46", 
         "#365d59", 
     ]
-    bars = ax.bar(labels, heights, color=hex_colors, edgecolor="black")
+    # One quad per bar, corners ordered (x0,0) (x0,h) (x1,h) (x1,0); only the
+    # two top corners (rows 1:3) move as proportions change.
+    bar_x = np.arange(6, dtype=np.float64)
+    verts = np.zeros((6, 4, 2))
+    verts[:, [0, 1], 0] = (bar_x - BAR_WIDTH / 2)[:, None]
+    verts[:, [2, 3], 0] = (bar_x + BAR_WIDTH / 2)[:, None]
+    verts[:, 1:3, 1] = props[:, None]
+    bars = PolyCollection(verts, facecolors=hex_colors, edgecolors="black")
+    ax.add_collection(bars, autolim=False)
+    ax.set_xticks(bar_x, labels)
+    ax.set_xlim(-0.6, 5.6)
 
     ax.set_ylim(0, .5)  # fixed y-axis to prevent jitter
     ax.set_ylabel("Proportion", fontsize=11)
@@ -83,86 +124,95 @@ def animate_live(delay_sec=0.1, seed=None):
     ax.tick_params(axis="x", labelsize=12)  # bump size up (try 14 if you want larger)
 
     exp_line = ax.axhline(1/6, linestyle="--", linewidth=.8, color="#c9a365ff", label="Expected Probability (1/6)")
-    ax.legend(loc="upper right", frameon=True)
+    legend = ax.legend(loc="upper right", frameon=True)
 
-    title = ax.set_title(f"Dice Proportions (n={n})", fontsize=16)
+    ax.set_title("Dice Proportions", fontsize=16)
+    # n readout sits inside the axes so it is covered by the blitted region
+    readout = AnchoredText(f"n={n}", loc="upper left", frameon=False,
+                           prop=dict(fontsize=11))
+    ax.add_artist(readout)
 
     # --- ADDED: running count labels for each bar ---
+    # Bar x-positions never change, so labels reuse bar_x
     count_labels = []
-    for i, f in enumerate(faces):
-        cnt = counts.get(f, 0)
-        x = bars[i].get_x() + bars[i].get_width() / 2
-        h = heights[i]
-        # place just above the bar initially
-        txt = ax.text(x, h + 0.02, str(cnt), ha="center", va="bottom", fontsize=9)
+    for i in range(6):
+        # always just above the bar (with ylim 0..0.5 an in-bar placement
+        # for tall bars would never be visible)
+        txt = ax.text(bar_x[i], heights[i] + 0.02, str(int(counts[i])),
+                      ha="center", va="bottom", fontsize=9, clip_on=True)
         count_labels.append(txt)
-
-    def _place_label(i, h, cnt):
-        """Reposition label based on bar height; keep it readable."""
-        x = bars[i].get_x() + bars[i].get_width() / 2
-        # If the bar is tall, put the label inside near the top in white
-        if h > 0.85:
-            count_labels[i].set_position((x, h - 0.05))
-            count_labels[i].set_va("top")
-            count_labels[i].set_color("white")
-        else:
-            # Otherwise, keep it above the bar in black
-            count_labels[i].set_position((x, h + 0.02))
-            count_labels[i].set_va("bottom")
-            count_labels[i].set_color("black")
-        count_labels[i].set_text(str(cnt))
     # --- END ADDED ---
 
     # Track latest state so pause/stop shows accurate n
     state = {"paused": False, "stopped": False, "n": n}
 
-    def update(_frame):
+    # Bars, labels, and readout are redrawn over a cached background each frame.
+    # The 1/6 line and legend are redrawn too, in zorder sequence, so they stay
+    # on top of the bars as in a normal draw.
+    # Every animated artist sits inside the axes, so only ax.bbox is copied/blitted
+    bm = BlitManager(
+        fig.canvas,
+        [bars, exp_line, *count_labels, readout, legend],
+        bbox=ax.bbox,
+    )
+
+    def update():
         if state["paused"] or state["stopped"]:
-            return bars  # no updates while paused/stopped
+            return  # no updates while paused/stopped
 
-        counts, props, n_now = next(gen)
-        for i, f in enumerate(faces):
-            h = props.get(f, 0.0)
-            bars[i].set_height(h)
-            # ADDED: update the label position/text with current count
-            _place_label(i, h, counts.get(f, 0))
+        if not sc.drain(q, max_events=MAX_PER_FRAME, on_event=_write_snapshot):
+            return  # nothing new since the last frame; skip the redraw
+        counts, props, n_now = sc.current()
 
-        snap.maybe_write(n_now, counts)  # NEW: sidecar snapshot; chart unchanged
+        # render only the final state of this batch
+        verts[:, 1:3, 1] = props[:, None]  # all six heights in one assignment
+        bars.set_verts(verts)
+        # ADDED: update the label height/text with current count
+        for txt, cnt, y in zip(count_labels, counts.tolist(), (props + 0.02).tolist()):
+            txt.set_text(str(cnt))
+            txt.set_y(y)
 
-        title.set_text(f"Dice Proportions (n={n_now})")
+        readout.txt.set_text(f"n={n_now}")
         state["n"] = n_now  # remember latest n for pause/stop display
-        return bars  # return value ignored when blit=False
-
-    # Keep a reference; no blit; disable frame cache
-    anim = FuncAnimation(
-        fig, update,
-        interval=100,
-        blit=False,
-        cache_frame_data=False
-    )
+        bm.update()
+
+    # Keep a reference; the timer drives frames, BlitManager does the drawing
+    timer = fig.canvas.new_timer(interval=FRAME_MS)
+    timer.add_callback(update)
+    timer.start()
 
     # Keys:
-    #   Space = pause/resume (accurate n in title)
+    #   Space = pause/resume (accurate n in readout)
     #   X     = stop (freeze last frame; window stays open)
     #   q     = default Matplotlib quit/close (unchanged)
     def on_key(event):
-        if event.key == " ":
+        if event.key == " " and not state["stopped"]:
             state["paused"] = not state["paused"]
             if state["paused"]:
-                anim.event_source.stop()
-                title.set_text(f"Dice Proportions (n={state['n']}) — PAUSED")
-                fig.canvas.draw_idle()
+                timer.stop()
+                readout.txt.set_text(f"n={state['n']} — PAUSED")
+                bm.update()  # blit the readout only; no full redraw
             else:
-                anim.event_source.start()
+                # clear PAUSED now; frames skip redraws until a new roll arrives
+                readout.txt.set_text(f"n={state['n']}")
+                bm.update()
+                timer.start()
         elif event.key in ("x", "X"):
             if not state["stopped"]:
                 state["stopped"] = True
-                anim.event_source.stop()
-                title.set_text(f"Dice Proportions (n={state['n']}) — STOPPED")
-                fig.canvas.draw_idle()
-                print("Animation stopped. Close window to exit.")   
+                timer.stop()
+                readout.txt.set_text(f"n={state['n']} — STOPPED")
+                bm.update()
+                print("Animation stopped. Close window to exit.")
 
     fig.canvas.mpl_connect("key_press_event", on_key)
+    # Stop ticking and rolling once the window is gone (other figures, or a
+    # REPL, may keep the process alive)
+    def on_close(_event):
+        timer.stop()
+        stop_producer.set()
+
+    fig.canvas.mpl_connect("close_event", on_close)
 
     plt.tight_layout()
     plt.show()
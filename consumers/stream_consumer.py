@@ -6,52 +6,126 @@ Lightweight dice stream consumer.
 - Wraps `producers.dice_producer.dice_stream` and maintains cumulative counts (1–6)
   and total rolls `n`, exposing current proportions on demand.
 - Public entrypoint: `consume_forever(delay_sec=0.2, seed=None, max_events=None)`,
-  a generator yielding `(counts: dict[int,int], proportions: dict[int,float], n: int)`
-  after each event.
+  a generator yielding `(counts: ndarray[6], proportions: ndarray[6], n: int)`
+  after each event; position i holds face i + 1. The arrays are reused
+  buffers (overwritten by later events), so copy them to keep a history.
+- Counts are kept in a 7-slot int64 array indexed directly by face (slot 0 unused).
+- Background ingestion: `start_producer(delay_sec=0.2, seed=None, maxsize=1024)`
+  runs `dice_stream` in a daemon thread feeding a bounded queue (oldest event
+  dropped when full, so the producer never blocks) and returns `(q, stop)`;
+  setting the `stop` event ends the thread after its current roll.
+  `StreamConsumer.drain(q)` folds in whatever has arrived without waiting.
 
 Intended use: import `consume_forever` from visualizers (e.g., `animate_dice.py`)
-to drive a live chart without re-implementing counting logic.
+to drive a live chart without re-implementing counting logic, or pair
+`start_producer` with `StreamConsumer.drain` so the producer's sleep never
+blocks a render loop.
 """
 
 
+import queue
+import threading
+
+import numpy as np
+
 from producers.dice_producer import dice_stream
 
 print("__name__ in stream_consumer:", __name__)
 
 def init_counts():
-    return {face: 0 for face in range(1, 7)}
-
-def proportions(counts):
-    total = sum(counts.values())
-    return {k: (counts[k] / total if total else 0.0) for k in counts}
+    return np.zeros(7, dtype=np.int64)
 
 class StreamConsumer:
     def __init__(self):
         self.counts = init_counts()
         self.n = 0
+        self._props = np.zeros(6)  # reused by current(); no per-call allocation
+
+    def process_outcome(self, outcome):
+        """Hot path: count one face 1..6 from `dice_stream` (no validation)."""
+        self.counts[outcome] += 1
+        self.n += 1
 
     def process_event(self, event):
-        if isinstance(event, dict) and event.get("event_type") == "dice":
+        """Back-compat shim: validate a tuple or dict event, then count it."""
+        # (trial_id, outcome) tuples from dice_stream
+        if isinstance(event, tuple):
+            if len(event) == 2:
+                outcome = event[1]
+                if isinstance(outcome, (int, np.integer)) and 1 <= outcome <= 6:
+                    self.process_outcome(outcome)
+        # Full event dictionaries (e.g., from producers.dice_producer.to_event)
+        elif isinstance(event, dict) and event.get("event_type") == "dice":
             outcome = event.get("outcome")
-            if isinstance(outcome, int) and 1 <= outcome <= 6:
-                self.counts[outcome] += 1
-                self.n += 1
+            if isinstance(outcome, (int, np.integer)) and 1 <= outcome <= 6:
+                self.process_outcome(outcome)
+
+    def drain(self, q, max_events=None, on_event=None):
+        """
+        Process queued (trial_id, outcome) tuples until `q` is empty (or
+        `max_events` reached), without blocking. `on_event(self)` is called after each event.
+        Returns the number of events taken from the queue.
+        """
+        taken = 0
+        while max_events is None or taken < max_events:
+            try:
+                evt = q.get_nowait()
+            except queue.Empty:
+                break
+            self.process_outcome(evt[1])  # queue is fed by dice_stream tuples
+            taken += 1
+            if on_event is not None:
+                on_event(self)
+        return taken
 
     def current(self):
-        return self.counts, proportions(self.counts), self.n
+        """
+        Return (counts, proportions, n). Both arrays are views of internal
+        buffers that later events overwrite; callers must not mutate them
+        and should copy them if they need to keep a snapshot.
+        """
+        face_counts = self.counts[1:]
+        if self.n:
+            np.divide(face_counts, self.n, out=self._props)
+        return face_counts, self._props, self.n
 
 def consume_forever(delay_sec=0.2, seed=None, max_events=None):
     sc = StreamConsumer()
     stream = dice_stream(delay_sec=delay_sec, seed=seed)
     i = 0
     while True:
-        evt = next(stream)
-        sc.process_event(evt)
+        _trial_id, outcome = next(stream)
+        sc.process_outcome(outcome)
         i += 1
         yield sc.current()
         if max_events is not None and i >= max_events:
             break
 
+def start_producer(delay_sec=0.2, seed=None, maxsize=1024):
+    """
+    Run `dice_stream` in a daemon thread. Returns `(q, stop)`: the bounded
+    queue it fills and a threading.Event that stops the thread when set.
+    """
+    q = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def _producer_loop():
+        for evt in dice_stream(delay_sec=delay_sec, seed=seed):
+            if stop.is_set():
+                break
+            try:
+                q.put_nowait(evt)
+            except queue.Full:
+                # drop the oldest event rather than block the producer
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+                q.put_nowait(evt)
+
+    threading.Thread(target=_producer_loop, daemon=True).start()
+    return q, stop
+
 if __name__ == "__main__":
     for counts, props, n in consume_forever(delay_sec=0.05, seed=1, max_events=10):
         print(n, counts, props)
@@ -3,11 +3,19 @@
 """
 Simple dice event producer.
 
-Generates an infinite stream of dice-roll events as dictionaries:
+Generates an infinite stream of dice rolls as lightweight tuples:
+    (trial_id, outcome)
+    trial_id: int  # 1, 2, 3, ...
+    outcome:  int  # 1..6, uniform RNG
+
+Rolls are drawn in batches of BATCH_SIZE with NumPy, so RNG cost is amortized
+across many events. Consumers that need the full event dictionary (with a
+timestamp) can wrap a tuple with `to_event`; timestamps come from a cached
+per-second prefix plus a microsecond suffix rather than a datetime per event:
 {
-    "trial_id": int,           # 1, 2, 3, ...
+    "trial_id": int,
     "event_type": "dice",
-    "outcome": 1..6,           # uniform RNG
+    "outcome": 1..6,
     "timestamp": ISO-8601 UTC  # e.g., "2025-10-07T01:23:45.678901+00:00"
 }
 
@@ -16,28 +24,59 @@ Args:
     seed (int | None): RNG seed for reproducible outcomes.
 
 Yields:
-    dict: One event per iteration.
+    tuple[int, int]: One (trial_id, outcome) pair per iteration.
 """
 
 
-import random
 import time
-from datetime import datetime, timezone
+
+import numpy as np
+
+BATCH_SIZE = 4096
+
+# Whole-second ISO prefix cache for _iso_utc_now()
+_cached_s = None
+_cached_prefix = ""
+
+def _iso_utc_now():
+    """
+    Current UTC time as ISO-8601 in the format of
+    datetime.now(timezone.utc).isoformat() (microseconds always included).
+    The seconds prefix is formatted
+    once per second; only the microsecond suffix is built per call.
+    """
+    global _cached_s, _cached_prefix
+    ns = time.time_ns()
+    s = ns // 1_000_000_000
+    if s != _cached_s:
+        _cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(s))
+        _cached_s = s
+    return f"{_cached_prefix}.{(ns // 1000) % 1_000_000:06d}+00:00"
+
+def to_event(trial_id, outcome):
+    """Expand a (trial_id, outcome) pair into the full event dictionary."""
+    return {
+        "trial_id": trial_id,
+        "event_type": "dice",
+        "outcome": outcome,
+        "timestamp": _iso_utc_now()
+    }
 
 def dice_stream(delay_sec=0.2, seed=None):
-    rng = random.Random(seed)
+    rng = np.random.default_rng(seed)
+    buf = None
+    i = BATCH_SIZE  # forces a draw on the first iteration
     trial_id = 0
     while True:
+        if i == BATCH_SIZE:
+            buf = rng.integers(1, 7, size=BATCH_SIZE, dtype=np.int8)
+            i = 0
         trial_id += 1
-        yield {
-            "trial_id": trial_id,
-            "event_type": "dice",
-            "outcome": rng.randint(1, 6),
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
+        yield (trial_id, int(buf[i]))
+        i += 1
         time.sleep(delay_sec)
 
 if __name__ == "__main__":
     s = dice_stream(delay_sec=0.1, seed=42)
     for _ in range(5):
-        print(next(s))
+        print(to_event(*next(s)))
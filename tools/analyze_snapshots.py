@@ -53,8 +53,8 @@ df = pd.read_csv(CSV_PATH, parse_dates=["ts"])
 df["run"] = (df["n"].diff().fillna(0) < 0).cumsum()
 
 # Build cumulative proportions from counts (robust even if CSV p1..p6 were per-batch)
-for i in range(1, 7):
-    df[f"p{i}_cum"] = df[f"c{i}"] / df["n"]
+count_cols = [f"c{i}" for i in range(1, 7)]
+df[[f"p{i}_cum" for i in range(1, 7)]] = df[count_cols].to_numpy() / df["n"].to_numpy()[:, None]
 
 # Focus plots on the latest run only (change to df to show all runs)
 latest = df[df["run"] == df["run"].max()].copy()
@@ -143,11 +143,11 @@ first_pass = (
 # ---------------------------
 # 4) End-of-run summary CSV
 # ---------------------------
-last_per_run = (
-    df.sort_values(["run", "n"])
-      .groupby("run")
-      .tail(1)[["run", "n", "max_abs_dev", "chi2", "p1", "p2", "p3", "p4", "p5", "p6"]]
-)
+# Row with the largest n per run (O(N); avoids sorting the whole frame)
+last_per_run = df.loc[
+    df.groupby("run")["n"].idxmax(),
+    ["run", "n", "max_abs_dev", "chi2", "p1", "p2", "p3", "p4", "p5", "p6"],
+]
 
 summary = last_per_run.merge(first_pass, on="run", how="left").sort_values("run")
 summary.to_csv(os.path.join(OUTDIR, "summary.csv"), index=False)
@@ -0,0 +1,88 @@
+# utils/blit.py
+
+"""
+Blit manager for Matplotlib animations.
+
+Purpose
+- Cache the static figure background once and, on each update, restore it and
+  redraw only the registered animated artists, then blit the result.
+- Refresh the cached background on every full draw (e.g., window resize) via
+  the canvas 'draw_event'.
+- By default the whole figure is cached and blitted; pass `bbox=ax.bbox` when
+  every animated artist lives inside one axes to copy only that region.
+
+Adapted from the Matplotlib "Faster rendering by using blitting" tutorial.
+"""
+
+
+class BlitManager:
+    def __init__(self, canvas, animated_artists=(), bbox=None):
+        """
+        Parameters
+        ----------
+        canvas : FigureCanvasAgg
+            The canvas to work with; only Agg-based canvases support
+            `copy_from_bbox` and `restore_region`.
+        animated_artists : Iterable[Artist]
+            Artists to manage and redraw on each update.
+        bbox : Bbox, optional
+            Region to cache and blit; defaults to the whole figure. Artists
+            drawn outside it will not reach the screen.
+        """
+        self.canvas = canvas
+        self._bbox = bbox
+        self._bg = None
+        self._artists = []
+
+        for a in animated_artists:
+            self.add_artist(a)
+        # grab the background on every draw
+        self.cid = canvas.mpl_connect("draw_event", self.on_draw)
+
+    def on_draw(self, event):
+        """Callback to register with 'draw_event'."""
+        cv = self.canvas
+        # savefig draws animated artists too (and vector formats swap in
+        # another canvas), so those draws must not replace the background
+        if event is not None and (event.canvas is not cv or cv.is_saving()):
+            return
+        self._bg = cv.copy_from_bbox(self._region())
+        self._draw_animated()
+
+    def _region(self):
+        """The bbox being cached and blitted."""
+        return self._bbox if self._bbox is not None else self.canvas.figure.bbox
+
+    def add_artist(self, art):
+        """
+        Add an artist to be managed.
+
+        The artist must belong to the figure of this canvas; it is marked
+        animated so the normal draw loop skips it.
+        """
+        if art.figure != self.canvas.figure:
+            raise RuntimeError
+        art.set_animated(True)
+        self._artists.append(art)
+
+    def _draw_animated(self):
+        """Draw all of the animated artists."""
+        fig = self.canvas.figure
+        for a in self._artists:
+            fig.draw_artist(a)
+
+    def update(self):
+        """Update the screen with animated artists."""
+        cv = self.canvas
+        # paranoia in case we missed the draw event
+        if self._bg is None:
+            self.on_draw(None)
+        else:
+            # restore the background
+            cv.restore_region(self._bg)
+            # draw all of the animated artists
+            self._draw_animated()
+            # update the GUI state
+            cv.blit(self._region())
+        # let the GUI event loop process anything it has to do
+        cv.flush_events()
@@ -7,6 +7,18 @@ Purpose
 - Append a summary row to a CSV every SNAPSHOT_EVERY rolls.
 - Each row stores: timestamp, total rolls (n), chi-square, max abs deviation,
   cumulative proportions p1..p6 (counts / n), and cumulative counts c1..c6.
+- The CSV is opened once (buffered) and closed at interpreter exit; rows are
+  formatted as plain strings rather than through csv.DictWriter.
+- Callers on a per-event hot path can test `should_write(n)` and call
+  `write(n, counts)` directly; `maybe_write` does both.
+- Writes are asynchronous: `write` only formats the row and enqueues it;
+  a daemon writer thread (started by `init()`) appends rows and flushes every
+  FLUSH_EVERY rows or after FLUSH_SEC idle. If the queue is full the oldest
+  pending row is dropped, so the caller never blocks on disk I/O. Pending rows
+  are written out at interpreter exit.
+- If the writer thread dies (e.g., an OSError from a full disk), `write` warns
+  and falls back to writing synchronously, so write errors surface to the
+  caller instead of rows being dropped silently.
 
 Environment
 - SNAPSHOT_EVERY: write interval (default: 50)
@@ -15,9 +27,14 @@ Environment
 
 
 import os
-import csv
+import atexit
+import queue
+import threading
 import time
-from typing import Dict, Iterable, List, Union
+import warnings
+from typing import Dict, Iterable, Union
+
+import numpy as np
 
 SNAPSHOT_EVERY = int(os.getenv("SNAPSHOT_EVERY", "50"))
 SNAPSHOT_PATH  = os.getenv("SNAPSHOT_PATH", "data/snapshots.csv")
@@ -28,50 +45,127 @@ FIELDS = [
     "c1","c2","c3","c4","c5","c6",
 ]
 
+QUEUE_SIZE = 4096   # pending rows before the oldest is dropped
+FLUSH_EVERY = 64    # rows written between flushes
+FLUSH_SEC = 1.0     # flush pending rows after this long without new ones
+
+_HEADER = ",".join(FIELDS) + "\n"
+_fh = None      # persistent append handle, opened by init()
+_q = None       # formatted rows awaiting the writer thread
+_writer = None  # daemon thread draining _q into _fh
+
 Faces = range(1, 7)
 CountsType = Union[Dict[int, int], Iterable[int]]
 
-def _counts_vec(counts: CountsType) -> List[int]:
+def _counts_vec(counts: CountsType) -> np.ndarray:
     """
-    Normalize counts into a list [c1..c6].
+    Normalize counts into an int64 array [c1..c6].
 
     Supports:
+      - ndarray of length 6 (c1..c6), returned as-is if already int64
+        (fast path), otherwise converted
       - dict keyed 1..6
       - list/tuple of length 6 (c1..c6)
     """
+    if isinstance(counts, np.ndarray):
+        if counts.shape != (6,):
+            raise ValueError(f"Expected 6 counts, got shape {counts.shape}")
+        return counts if counts.dtype == np.int64 else counts.astype(np.int64)
     if isinstance(counts, dict):
-        return [int(counts.get(i, 0)) for i in Faces]
+        return np.array([counts.get(i, 0) for i in Faces], dtype=np.int64)
     # Assume ordered iterable [c1..c6]
-    vals = list(counts)
-    if len(vals) != 6:
-        raise ValueError(f"Expected 6 counts, got {len(vals)}")
-    return [int(v) for v in vals]
+    vec = np.asarray(list(counts), dtype=np.int64)
+    if vec.shape != (6,):
+        raise ValueError(f"Expected 6 counts, got {len(vec)}")
+    return vec
 
-def _proportions(counts: CountsType, n: int) -> List[float]:
+def _proportions(counts: CountsType, n: int) -> np.ndarray:
     """Cumulative proportions p_i = c_i / n; returns [p1..p6]."""
     if n <= 0:
-        return [0.0] * 6
-    vec = _counts_vec(counts)
-    return [c / n for c in vec]
+        return np.zeros(6)
+    return _counts_vec(counts) / n
 
 def _chi2(counts: CountsType, n: int) -> float:
     """Pearson chi-square against a fair die (df=5; expected = n/6)."""
     if n <= 0:
         return 0.0
-    vec = _counts_vec(counts)
-    exp = n / 6
-    return sum(((c - exp) ** 2) / exp for c in vec)
+    d = _counts_vec(counts) - n / 6
+    return float((d * d).sum() * 6.0 / n)
 
-def _max_abs_dev(props: List[float]) -> float:
+def _max_abs_dev(props: np.ndarray) -> float:
     """Max |p(face) - 1/6| across faces."""
-    return max(abs(p - 1/6) for p in props) if props else 0.0
+    return float(np.abs(props - 1/6).max()) if len(props) else 0.0
+
+def _drain() -> None:
+    """Writer thread: append queued rows to the CSV until a None sentinel arrives."""
+    pending = 0
+    while True:
+        try:
+            line = _q.get(timeout=FLUSH_SEC)
+        except queue.Empty:
+            if pending:
+                _fh.flush()
+                pending = 0
+            continue
+        if line is None:
+            break
+        _fh.write(line)
+        pending += 1
+        if pending >= FLUSH_EVERY:
+            _fh.flush()
+            pending = 0
+    _fh.flush()
+
+def _write_pending() -> None:
+    """Write queued rows from the calling thread (writer thread is gone)."""
+    while True:
+        try:
+            line = _q.get_nowait()
+        except queue.Empty:
+            return
+        if line is not None:
+            _fh.write(line)
+
+def _shutdown() -> None:
+    """Stop the writer thread after it has written every queued row, then close."""
+    if _writer.is_alive():
+        try:
+            # bounded: the writer may die while we wait on a full queue
+            _q.put(None, timeout=FLUSH_SEC)
+        except queue.Full:
+            pass
+        _writer.join(timeout=5.0)
+    if not _writer.is_alive():
+        try:
+            _write_pending()
+        finally:
+            _fh.close()
 
 def init() -> None:
-    """Ensure the output directory exists and the CSV has a header."""
+    """
+    Ensure the output directory exists, the CSV has a header, the append
+    handle is open, and the writer thread is running. Safe to call more
+    than once.
+    """
+    global _fh, _q, _writer
+    if _fh is not None:
+        return
     os.makedirs(os.path.dirname(SNAPSHOT_PATH) or ".", exist_ok=True)
-    if not os.path.exists(SNAPSHOT_PATH):
-        with open(SNAPSHOT_PATH, "w", newline="") as f:
-            csv.DictWriter(f, fieldnames=FIELDS).writeheader()
+    is_new = not os.path.exists(SNAPSHOT_PATH)
+    _fh = open(SNAPSHOT_PATH, "a", buffering=1 << 16)
+    if is_new:
+        _fh.write(_HEADER)
+    _q = queue.Queue(maxsize=QUEUE_SIZE)
+    _writer = threading.Thread(target=_drain, name="snapshot-writer", daemon=True)
+    _writer.start()
+    atexit.register(_shutdown)
+
+def should_write(n: int) -> bool:
+    """
+    True when a snapshot is due at n rolls. Cheap enough to call per event,
+    so hot loops can test it before building the counts argument.
+    """
+    return SNAPSHOT_EVERY > 0 and n % SNAPSHOT_EVERY == 0
 
 def maybe_write(n: int, counts: CountsType) -> None:
     """
@@ -80,9 +174,11 @@ def maybe_write(n: int, counts: CountsType) -> None:
     Expects cumulative counts (totals so far). If you accidentally pass
     per-batch counts, proportions will not represent convergence.
     """
-    if SNAPSHOT_EVERY <= 0 or (n % SNAPSHOT_EVERY) != 0:
-        return
+    if should_write(n):
+        write(n, counts)
 
+def write(n: int, counts: CountsType) -> None:
+    """Append a snapshot row unconditionally (see `should_write`)."""
     vec = _counts_vec(counts)
     # Optional safety: ensure counts sum to n (cumulative totals).
     # Comment this back in if you want a hard guarantee.
@@ -90,15 +186,27 @@ def maybe_write(n: int, counts: CountsType) -> None:
     #     raise AssertionError(f"Expected cumulative counts: sum={sum(vec)}, n={n}")
 
     ps = _proportions(vec, n)
-    row = {
-        "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
-        "n": n,
-        "max_abs_dev": round(_max_abs_dev(ps), 6),
-        "chi2": round(_chi2(vec, n), 6),
-        "p1": ps[0], "p2": ps[1], "p3": ps[2],
-        "p4": ps[3], "p5": ps[4], "p6": ps[5],
-        "c1": vec[0], "c2": vec[1], "c3": vec[2],
-        "c4": vec[3], "c5": vec[4], "c6": vec[5],
-    }
-    with open(SNAPSHOT_PATH, "a", newline="") as f:
-        csv.DictWriter(f, fieldnames=FIELDS).writerow(row)
+    if _fh is None:
+        init()
+    # Column order must match FIELDS
+    line = (
+        f"{time.strftime('%Y-%m-%dT%H:%M:%S')},{n},"
+        f"{_max_abs_dev(ps):.6f},{_chi2(vec, n):.6f},"
+        + ",".join(map(repr, ps.tolist())) + ","
+        + ",".join(map(str, vec.tolist())) + "\n"
+    )
+    if not _writer.is_alive():
+        warnings.warn("snapshot writer thread stopped; writing synchronously",
+                      RuntimeWarning, stacklevel=2)
+        _write_pending()  # keep row order: older queued rows first
+        _fh.write(line)
+        return
+    try:
+        _q.put_nowait(line)
+    except queue.Full:
+        # drop the oldest pending row rather than block the stream
+        try:
+            _q.get_nowait()
+        except queue.Empty:
+            pass
+        _q.put_nowait(line)